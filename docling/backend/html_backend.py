@@ -28,6 +28,7 @@ from docling_core.types.doc import (
     GraphLinkLabel,
     GroupItem,
     GroupLabel,
+    ListItem,
     PictureClassificationLabel,
     PictureClassificationMetaField,
     PictureClassificationPrediction,
@@ -71,6 +72,31 @@ try:  # pragma: no cover - import-time guard
 except ImportError as e:  # pragma: no cover - import-time guard
     _BS4_IMPORT_ERROR = e
 
+
+def _select_html_parser() -> str:
+    """Select the BeautifulSoup tree builder used to parse HTML.
+
+    The C-based lxml builder is considerably faster than the pure-Python
+    "html.parser" on large documents. bs4 only registers it once `lxml.etree`
+    imports successfully, so a missing or broken lxml falls back to the standard
+    library parser.
+
+    Note that the two parsers repair malformed markup differently, e.g. lxml
+    closes an unterminated `<li>` at the next `<li>`.
+
+    Returns:
+        The name of the tree builder to pass to BeautifulSoup.
+    """
+    if _BS4_AVAILABLE:
+        from bs4.builder import builder_registry
+
+        if builder_registry.lookup("lxml") is not None:
+            return "lxml"
+    return "html.parser"
+
+
+_HTML_PARSER: str = _select_html_parser()
+
 _INSTALL_HINT = (
     "The 'beautifulsoup4' package is required to process HTML files. "
     "Install it with `pip install 'docling-slim[format-html]'`."
@@ -109,6 +135,8 @@ _BLOCK_TAGS: Final = {
     "ul",
 }
 
+_HEADING_TAGS: Final = frozenset({"h1", "h2", "h3", "h4", "h5", "h6"})
+
 # Block-level elements that should not appear inside <p>
 _PARA_BREAKERS = {
     "address",
@@ -148,6 +176,9 @@ _PARA_BREAKERS = {
 
 _CODE_TAG_SET: Final = {"code", "kbd", "samp"}
 
+# Tags whose extracted text is followed by a space in get_text()
+_SPACED_TEXT_TAGS: Final = {"p", "li", "th", "td"}
+
 _FORMAT_TAG_MAP: Final = {
     "b": {"bold": True},
     "strong": {"bold": True},
@@ -168,6 +199,8 @@ _FORMAT_TAG_MAP: Final = {
 _DATA_DOCLING_ID_ATTR: Final = "data-docling-id"
 _FORM_CONTAINER_CLASS: Final = "form_region"
 _ROW_SECTION_CLASS: Final = "row_section"
+_SPAN_NUMBER_RE: Final = re.compile(r"\d+")
+_WHITESPACE_RE: Final = re.compile(r"\s+")
 _FORM_KEY_ID_RE: Final = re.compile(r"^key(?P<key_id>[A-Za-z0-9]+)$")
 _FORM_MARKER_ID_RE: Final = re.compile(r"^key(?P<key_id>[A-Za-z0-9]+)_marker$")
 _FORM_VALUE_ID_RE: Final = re.compile(
@@ -210,6 +243,10 @@ _INLINE_HTML_TAGS: Final = {
     "var",
 }
 
+# Paragraph-like block containers that may contribute inline segments when mixed
+# with formatting tags (e.g., <p>text <strong>bold</strong>)
+_INLINE_GROUP_CONTAINER_TAGS: Final = frozenset({"p", "address", "summary", "td", "th"})
+
 
 @dataclass(frozen=True)
 class _RenderedBBox:
@@ -217,6 +254,16 @@ class _RenderedBBox:
     bbox: BoundingBox
 
 
+@dataclass
+class _TableRow:
+    """A table row with its cells and their (col_span, row_span) values."""
+
+    tag: Tag
+    cells: list[tuple[Tag, int, int]]
+    col_header: bool
+    row_header: bool
+
+
 @dataclass
 class _ExtractedFormValue:
     tag: Tag
@@ -447,11 +494,10 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
         # Initialize the parents for the hierarchy
         self.max_levels = 10
         self.level = 0
-        self.parents: dict[int, Optional[Union[DocItem, GroupItem]]] = {}
+        self.parents: list[Optional[Union[DocItem, GroupItem]]]
+        self.parents = [None] * self.max_levels
         self.ctx = _Context()
         self._disable_inline_group_depth: int = 0
-        for i in range(self.max_levels):
-            self.parents[i] = None
         self.hyperlink: Union[AnyUrl, Path, None] = None
         self.format_tags: list[str] = []
         self._raw_html_bytes: Optional[bytes] = None
@@ -473,8 +519,11 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
                 if isinstance(path_or_stream, BytesIO)
                 else Path(path_or_stream).read_bytes()
             )
-            self._raw_html_bytes = raw
-            self.soup = BeautifulSoup(raw, "html.parser")
+            # The raw bytes are only needed to render the page in a browser, so
+            # don't keep a second copy of the document alive otherwise.
+            if options.render_page:
+                self._raw_html_bytes = raw
+            self.soup = BeautifulSoup(raw, _HTML_PARSER)
         except Exception as e:
             raise DocumentLoadError(
                 "Could not initialize HTML backend for file with "
@@ -517,7 +566,7 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
         if cast(HTMLBackendOptions, self.options).render_page:
             self._render_with_browser()
             if self._rendered_html:
-                self.soup = BeautifulSoup(self._rendered_html, "html.parser")
+                self.soup = BeautifulSoup(self._rendered_html, _HTML_PARSER)
 
         if self._rendered_page_images and self._rendered_page_size:
             render_dpi = cast(HTMLBackendOptions, self.options).render_dpi
@@ -550,22 +599,29 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
 
         content = self.soup.body or self.soup
 
-        # normalize <br> tags - use sentinel to distinguish from source newlines
-        for text_node in content.find_all(string=True):
-            if _BR_SENTINEL in text_node:
-                text_node.replace_with(text_node.replace(_BR_SENTINEL, ""))
-        for br in content("br"):
-            br.replace_with(NavigableString(_BR_SENTINEL))
-
-        # Furniture before the first heading rule, except for headers in tables
-        header = None
-        # Find all headers first
-        all_headers = content.find_all(["h1", "h2", "h3", "h4", "h5", "h6"])
-        # Keep only those that do NOT have a <table> in a parent chain
-        clean_headers = [h for h in all_headers if not h.find_parent("table")]
-        # Pick the first header from the remaining
-        if len(clean_headers):
-            header = clean_headers[0]
+        # normalize <br> tags - use sentinel to distinguish from source newlines.
+        # A single pass drops stray sentinels from the text and replaces each <br>.
+        for node in list(content.descendants):
+            if node.parent is None:
+                continue
+            if isinstance(node, Tag):
+                if node.name == "br":
+                    node.replace_with(NavigableString(_BR_SENTINEL))
+            elif isinstance(node, NavigableString) and _BR_SENTINEL in node:
+                node.replace_with(node.replace(_BR_SENTINEL, ""))
+
+        # Furniture before the first heading rule, except for headers in tables.
+        # Scan lazily and stop at the first header without a <table> ancestor.
+        header = next(
+            (
+                el
+                for el in content.descendants
+                if isinstance(el, Tag)
+                and el.name in _HEADING_TAGS
+                and not el.find_parent("table")
+            ),
+            None,
+        )
         # Set starting content layer
         self.content_layer = (
             ContentLayer.BODY
@@ -651,7 +707,7 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
     def _inject_base_tag(self, html_text: str, base_url: Optional[str]) -> str:
         if not base_url:
             return html_text
-        soup = BeautifulSoup(html_text, "html.parser")
+        soup = BeautifulSoup(html_text, _HTML_PARSER)
         if soup.head is None:
             return html_text
         if soup.head.find("base") is not None:
@@ -988,6 +1044,8 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
         return bbox.l < 0 or bbox.t < 0 or bbox.r < 0 or bbox.b < 0
 
     def _is_tag_outside_capture_area(self, tag: Tag) -> bool:
+        if not self._rendered_bbox_by_id and not self._rendered_text_bbox_by_id:
+            return False
         rendered = self._get_rendered_text_bbox_for_tag(
             tag
         ) or self._get_rendered_bbox_for_tag(tag)
@@ -1347,9 +1405,8 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
 
             _flush_para_if_empty()
 
-            siblings = list(parent.children)
             try:
-                idx = siblings.index(p)
+                idx = parent.index(p)
             except ValueError:
                 # p might have been removed
                 continue
@@ -1471,63 +1528,55 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
         docling_table: TableItem,
         num_rows: int,
         num_cols: int,
+        rows: Optional[list[_TableRow]] = None,
     ) -> Optional[TableData]:
-        for t in cast(list[Tag], element.find_all(["thead", "tbody"], recursive=False)):
-            t.unwrap()
+        if rows is None:
+            rows, _, _ = self._collect_table_rows(element)
 
         _log.debug(f"The table has {num_rows} rows and {num_cols} cols.")
-        grid: list = [[None for _ in range(num_cols)] for _ in range(num_rows)]
+        # Occupancy map of the table grid, to skip positions covered by spans
+        grid: list[list[bool]] = [[False] * num_cols for _ in range(num_rows)]
         data = TableData(num_rows=num_rows, num_cols=num_cols, table_cells=[])
+        # Most tables have no formulas, so skip the per-cell search for them
+        has_formulas = element.find("inline-formula") is not None
 
         # Iterate over the rows in the table
         start_row_span = 0
         row_idx = -1
 
-        # We don't want this recursive to support nested tables
-        for row in element("tr", recursive=False):
-            if not isinstance(row, Tag):
-                continue
+        for table_row in rows:
             row_classes = {
-                class_name.lower() for class_name in self._get_tag_classes(row)
+                class_name.lower()
+                for class_name in self._get_tag_classes(table_row.tag)
             }
             row_is_row_section = _ROW_SECTION_CLASS in row_classes
-            # For each row, find all the column cells (both <td> and <th>)
-            # We don't want this recursive to support nested tables
-            cells = row(["td", "th"], recursive=False)
             # Check if cell is in a column header or row header
-            col_header = True
-            row_header = True
-            for html_cell in cells:
-                if isinstance(html_cell, Tag):
-                    _, row_span = HTMLDocumentBackend._get_cell_spans(html_cell)
-                    if html_cell.name == "td":
-                        col_header = False
-                        row_header = False
-                    elif row_span == 1:
-                        row_header = False
+            col_header = table_row.col_header
+            row_header = table_row.row_header
             if not row_header:
                 row_idx += 1
                 start_row_span = 0
             else:
                 start_row_span += 1
 
+            # Row offset of every cell in this row
+            start_row = row_idx + start_row_span
+
             # Extract the text content of each cell
             col_idx = 0
-            for html_cell in cells:
-                if not isinstance(html_cell, Tag):
-                    continue
-                cell_classes = {
+            for html_cell, col_span, row_span in table_row.cells:
+                row_section = row_is_row_section or _ROW_SECTION_CLASS in {
                     class_name.lower()
                     for class_name in self._get_tag_classes(html_cell)
                 }
-                row_section = row_is_row_section or (_ROW_SECTION_CLASS in cell_classes)
 
                 # extract inline formulas
-                for formula in html_cell("inline-formula"):
-                    math_parts = formula.text.split("$$")
-                    if len(math_parts) == 3:
-                        math_formula = f"$${math_parts[1]}$$"
-                        formula.replace_with(NavigableString(math_formula))
+                if has_formulas:
+                    for formula in html_cell("inline-formula"):
+                        math_parts = formula.text.split("$$")
+                        if len(math_parts) == 3:
+                            math_formula = f"$${math_parts[1]}$$"
+                            formula.replace_with(NavigableString(math_formula))
 
                 provs_in_cell: list[RefItem] = []
                 rich_table_cell = self._is_rich_table_cell(html_cell)
@@ -1536,7 +1585,9 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
                     with self._use_table_cell_context():
                         provs_in_cell = self._walk(html_cell, doc)
 
-                    group_name = f"rich_cell_group_{len(doc.tables)}_{col_idx}_{start_row_span + row_idx}"
+                    group_name = (
+                        f"rich_cell_group_{len(doc.tables)}_{col_idx}_{start_row}"
+                    )
                     rich_table_cell, ref_for_rich_cell = (
                         HTMLDocumentBackend.process_rich_table_cells(
                             provs_in_cell, group_name, doc, docling_table
@@ -1547,22 +1598,21 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
                 text = HTMLDocumentBackend._clean_unicode(
                     self.get_text(html_cell).strip()
                 )
-                col_span, row_span = self._get_cell_spans(html_cell)
                 cell_bbox = None
                 rendered_cell = self._get_rendered_bbox_for_tag(html_cell)
                 if rendered_cell is not None:
                     cell_bbox = rendered_cell.bbox
                 if row_header:
                     row_span -= 1
-                while (
-                    col_idx < num_cols
-                    and grid[row_idx + start_row_span][col_idx] is not None
-                ):
-                    col_idx += 1
-                for r in range(start_row_span, start_row_span + row_span):
-                    for c in range(col_span):
-                        if row_idx + r < num_rows and col_idx + c < num_cols:
-                            grid[row_idx + r][col_idx + c] = text
+                # Skip the positions already covered by spans, scanning in C
+                if col_idx < num_cols:
+                    try:
+                        col_idx = grid[start_row].index(False, col_idx)
+                    except ValueError:
+                        col_idx = num_cols
+                col_end = min(col_idx + col_span, num_cols)
+                for r in range(start_row, min(start_row + row_span, num_rows)):
+                    grid[r][col_idx:col_end] = [True] * (col_end - col_idx)
 
                 if rich_table_cell:
                     rich_cell = RichTableCell(
@@ -1570,8 +1620,8 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
                         bbox=cell_bbox,
                         row_span=row_span,
                         col_span=col_span,
-                        start_row_offset_idx=start_row_span + row_idx,
-                        end_row_offset_idx=start_row_span + row_idx + row_span,
+                        start_row_offset_idx=start_row,
+                        end_row_offset_idx=start_row + row_span,
                         start_col_offset_idx=col_idx,
                         end_col_offset_idx=col_idx + col_span,
                         column_header=col_header,
@@ -1586,8 +1636,8 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
                         bbox=cell_bbox,
                         row_span=row_span,
                         col_span=col_span,
-                        start_row_offset_idx=start_row_span + row_idx,
-                        end_row_offset_idx=start_row_span + row_idx + row_span,
+                        start_row_offset_idx=start_row,
+                        end_row_offset_idx=start_row + row_span,
                         start_col_offset_idx=col_idx,
                         end_col_offset_idx=col_idx + col_span,
                         column_header=col_header,
@@ -1632,6 +1682,8 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
                 with self._use_inline_group(
                     annotated_text_list, doc, force=force_inline_group
                 ) as inline_ref:
+                    text_parent = self.parents[self.level]
+                    text_layer = self.content_layer
                     for annotated_text, source_tag_ids in compacted_parts:
                         if annotated_text.text.strip():
                             seg_clean = HTMLDocumentBackend._clean_unicode(
@@ -1644,9 +1696,9 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
                                     source_tag_ids=source_tag_ids,
                                 )
                                 docling_code2 = doc.add_code(
-                                    parent=self.parents[self.level],
+                                    parent=text_parent,
                                     text=seg_clean,
-                                    content_layer=self.content_layer,
+                                    content_layer=text_layer,
                                     formatting=annotated_text.formatting,
                                     hyperlink=annotated_text.hyperlink,
                                     prov=prov,
@@ -1660,10 +1712,10 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
                                     source_tag_ids=source_tag_ids,
                                 )
                                 docling_text2 = doc.add_text(
-                                    parent=self.parents[self.level],
+                                    parent=text_parent,
                                     label=DocItemLabel.TEXT,
                                     text=seg_clean,
-                                    content_layer=self.content_layer,
+                                    content_layer=text_layer,
                                     formatting=annotated_text.formatting,
                                     hyperlink=annotated_text.hyperlink,
                                     prov=prov,
@@ -1692,16 +1744,6 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
                         # the <br> tag itself has no rendered bbox.
                         _flush_buffer()
                     continue
-                has_block_descendants = bool(
-                    node.find(_BLOCK_TAGS)
-                    or node.find("input")
-                    or node.find(
-                        lambda item: (
-                            isinstance(item, Tag) and self._is_custom_checkbox_tag(item)
-                        )
-                    )
-                )
-                has_pending_form_fields = self._has_pending_form_field_in_subtree(node)
                 if self._is_form_container(node):
                     _flush_buffer()
                     form_refs = self._handle_form_container(node, doc)
@@ -1730,7 +1772,9 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
                     if input_ref:
                         added_refs.append(input_ref)
                 elif name in _FORMAT_TAG_MAP:
-                    if has_block_descendants or has_pending_form_fields:
+                    if self._has_block_descendants(
+                        node
+                    ) or self._has_pending_form_field_in_subtree(node):
                         _flush_buffer()
                         with self._use_format([name]):
                             wk = self._walk(node, doc)
@@ -1745,7 +1789,9 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
                                 )
                             )
                 elif name == "a":
-                    if has_block_descendants or has_pending_form_fields:
+                    if self._has_block_descendants(
+                        node
+                    ) or self._has_pending_form_field_in_subtree(node):
                         _flush_buffer()
                         with self._use_hyperlink(node):
                             wk2 = self._walk(node, doc)
@@ -1773,11 +1819,11 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
                     _flush_buffer()
                     blk = self._handle_block(node, doc)
                     added_refs.extend(blk)
-                elif has_block_descendants:
+                elif self._has_block_descendants(node):
                     _flush_buffer()
                     wk3 = self._walk(node, doc)
                     added_refs.extend(wk3)
-                elif has_pending_form_fields:
+                elif self._has_pending_form_field_in_subtree(node):
                     # Preserve DOM reading order: recurse into inline containers
                     # with pending form fields instead of bulk-emitting them.
                     _flush_buffer()
@@ -1816,6 +1862,22 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
         _flush_buffer()
         return added_refs
 
+    def _has_block_descendants(self, tag: Tag) -> bool:
+        """Whether a tag contains elements that must be emitted as separate items.
+
+        The check is done in a single pass over the descendants of the tag.
+        """
+        return (
+            tag.find(
+                lambda item: (
+                    item.name in _BLOCK_TAGS
+                    or item.name == "input"
+                    or self._is_custom_checkbox_tag(item)
+                )
+            )
+            is not None
+        )
+
     @staticmethod
     def _collect_parent_format_tags(item: PageElement) -> list[str]:
         tags = []
@@ -1876,8 +1938,7 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
             else:
                 # For normal content, collapse newlines to spaces (HTML spec behavior)
                 # but preserve the sentinel character for explicit <br> tags
-                text = item.replace("\n", " ").replace("\r", " ")
-                text = " ".join(text.split())
+                text = _WHITESPACE_RE.sub(" ", item).strip()
 
             code = any(code_tag in self.format_tags for code_tag in _CODE_TAG_SET)
             source_tag_id = (
@@ -1998,9 +2059,6 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
             for annotated_text in annotated_text_list
         ):
             return True
-        # Allow paragraph-like block containers to contribute inline segments
-        # when mixed with formatting tags (e.g., <p>text <strong>bold</strong>).
-        inline_group_container_tags = {"p", "address", "summary", "td", "th"}
         for annotated_text in annotated_text_list:
             source_tag_id = annotated_text.source_tag_id
             if source_tag_id is None:
@@ -2010,11 +2068,19 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
                 return False
             if (
                 tag_name not in _INLINE_HTML_TAGS
-                and tag_name not in inline_group_container_tags
+                and tag_name not in _INLINE_GROUP_CONTAINER_TAGS
             ):
                 return False
         return True
 
+    def _set_parent(
+        self, level: int, item: Optional[Union[DocItem, GroupItem]]
+    ) -> None:
+        """Set the parent item of a hierarchy level, growing the stack if needed."""
+        if level >= len(self.parents):
+            self.parents.extend([None] * (level + 1 - len(self.parents)))
+        self.parents[level] = item
+
     @contextmanager
     def _use_inline_group(
         self,
@@ -2047,12 +2113,12 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
             parent=self.parents[self.level],
             content_layer=self.content_layer,
         )
-        self.parents[self.level + 1] = inline_fmt
+        self._set_parent(self.level + 1, inline_fmt)
         self.level += 1
         try:
             yield inline_fmt.get_ref()
         finally:
-            self.parents[self.level] = None
+            self._set_parent(self.level, None)
             self.level -= 1
 
     @contextmanager
@@ -2066,28 +2132,31 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
             tag: The details tag.
             doc: Currently used document.
         """
-        self.parents[self.level + 1] = doc.add_group(
-            name=tag.name,
-            label=GroupLabel.SECTION,
-            parent=self.parents[self.level],
-            content_layer=self.content_layer,
+        self._set_parent(
+            self.level + 1,
+            doc.add_group(
+                name=tag.name,
+                label=GroupLabel.SECTION,
+                parent=self.parents[self.level],
+                content_layer=self.content_layer,
+            ),
         )
         self.level += 1
         try:
             yield None
         finally:
-            self.parents[self.level + 1] = None
+            self._set_parent(self.level + 1, None)
             self.level -= 1
 
     @contextmanager
     def _use_form_container(self, form_item: DocItem):
         """Create a form container group and set it as the current parent."""
-        self.parents[self.level + 1] = form_item
+        self._set_parent(self.level + 1, form_item)
         self.level += 1
         try:
             yield None
         finally:
-            self.parents[self.level + 1] = None
+            self._set_parent(self.level + 1, None)
             self.level -= 1
 
     @contextmanager
@@ -2103,17 +2172,20 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
         """
         current_layer = self.content_layer
         self.content_layer = ContentLayer.FURNITURE
-        self.parents[self.level + 1] = doc.add_group(
-            name=tag.name,
-            label=GroupLabel.SECTION,
-            parent=self.parents[self.level],
-            content_layer=self.content_layer,
+        self._set_parent(
+            self.level + 1,
+            doc.add_group(
+                name=tag.name,
+                label=GroupLabel.SECTION,
+                parent=self.parents[self.level],
+                content_layer=self.content_layer,
+            ),
         )
         self.level += 1
         try:
             yield None
         finally:
-            self.parents[self.level + 1] = None
+            self._set_parent(self.level + 1, None)
             self.level -= 1
             self.content_layer = current_layer
 
@@ -2133,7 +2205,9 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
             self.parents = original_parents
 
     @contextmanager
-    def _use_list_item_context(self, parent_item: RefItem | None) -> Iterator[None]:
+    def _use_list_item_context(
+        self, parent_item: Optional[Union[DocItem, GroupItem]]
+    ) -> Iterator[None]:
         """Set up context for processing nested content within a list item.
 
         Args:
@@ -2144,12 +2218,12 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
         and the parent is set. When exiting, the level and parent are restored.
         """
         if parent_item:
-            self.parents[self.level + 1] = parent_item
+            self._set_parent(self.level + 1, parent_item)
             self.level += 1
             try:
                 yield
             finally:
-                self.parents[self.level + 1] = None
+                self._set_parent(self.level + 1, None)
                 self.level -= 1
         else:
             yield
@@ -2172,15 +2246,17 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
         )
         # the first level is for the title item
         if level == 1:
-            for key in self.parents.keys():
-                self.parents[key] = None
+            self.parents[:] = [None] * len(self.parents)
             self.level = 0
-            self.parents[self.level + 1] = doc.add_title(
-                text_clean,
-                content_layer=self.content_layer,
-                formatting=annotated_text.formatting,
-                hyperlink=annotated_text.hyperlink,
-                prov=prov,
+            self._set_parent(
+                self.level + 1,
+                doc.add_title(
+                    text_clean,
+                    content_layer=self.content_layer,
+                    formatting=annotated_text.formatting,
+                    hyperlink=annotated_text.hyperlink,
+                    prov=prov,
+                ),
             )
             p1 = self.parents[self.level + 1]
             if p1 is not None:
@@ -2192,29 +2268,33 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
                 # add invisible group
                 for i in range(self.level, level):
                     _log.debug(f"Adding invisible group to level {i}")
-                    self.parents[i + 1] = doc.add_group(
-                        name=f"header-{i + 1}",
-                        label=GroupLabel.SECTION,
-                        parent=self.parents[i],
-                        content_layer=self.content_layer,
+                    self._set_parent(
+                        i + 1,
+                        doc.add_group(
+                            name=f"header-{i + 1}",
+                            label=GroupLabel.SECTION,
+                            parent=self.parents[i],
+                            content_layer=self.content_layer,
+                        ),
                     )
                 self.level = level
             elif level < self.level:
                 # remove the tail
-                for key in self.parents.keys():
-                    if key > level + 1:
-                        _log.debug(f"Remove the tail of level {key}")
-                        self.parents[key] = None
+                _log.debug(f"Remove the tail from level {level + 2}")
+                self.parents[level + 2 :] = [None] * (len(self.parents) - level - 2)
                 self.level = level
-            self.parents[self.level + 1] = doc.add_heading(
-                parent=self.parents[self.level],
-                text=text_clean,
-                orig=annotated_text.text,
-                level=self.level,
-                content_layer=self.content_layer,
-                formatting=annotated_text.formatting,
-                hyperlink=annotated_text.hyperlink,
-                prov=prov,
+            self._set_parent(
+                self.level + 1,
+                doc.add_heading(
+                    parent=self.parents[self.level],
+                    text=text_clean,
+                    orig=annotated_text.text,
+                    level=self.level,
+                    content_layer=self.content_layer,
+                    formatting=annotated_text.formatting,
+                    hyperlink=annotated_text.hyperlink,
+                    prov=prov,
+                ),
             )
             p2 = self.parents[self.level + 1]
             if p2 is not None:
@@ -2244,6 +2324,37 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
             parent = parent.parent
         return False
 
+    def _find_list_item_controls(self, li: Tag) -> tuple[list[Tag], list[Tag]]:
+        """Find the inputs and custom checkboxes that belong to a list item.
+
+        Controls inside nested list items are left to those items, so their
+        subtrees are not scanned. A nested list item that is itself a custom
+        checkbox still belongs to this item.
+
+        Args:
+            li: The list item tag.
+
+        Returns:
+            The input tags and the custom checkbox tags, in document order.
+        """
+        inputs: list[Tag] = []
+        checkboxes: list[Tag] = []
+        stack: list[Tag] = [
+            child for child in reversed(li.contents) if isinstance(child, Tag)
+        ]
+        while stack:
+            node = stack.pop()
+            if node.name == "input":
+                inputs.append(node)
+            if self._is_custom_checkbox_tag(node):
+                checkboxes.append(node)
+            if node.name == "li":
+                continue
+            stack.extend(
+                child for child in reversed(node.contents) if isinstance(child, Tag)
+            )
+        return inputs, checkboxes
+
     def _process_nested_element(
         self,
         elem,
@@ -2270,7 +2381,7 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
                 # Only process top-level lists (not nested within other lists)
                 if not self._has_list_ancestor(elem, li):
                     self._handle_block(elem, doc)
-                    self.parents[self.level + 1] = None
+                    self._set_parent(self.level + 1, None)
             elif elem.name == "table":
                 # Dispatch nested tables to the block handler so they are parsed
                 # as tables instead of being flattened into the list item text.
@@ -2278,7 +2389,7 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
                 # list branch): _handle_block consumes the whole table, so its
                 # descendants are never re-walked by _process_nested_element.
                 self._handle_block(elem, doc)
-                self.parents[self.level + 1] = None
+                self._set_parent(self.level + 1, None)
             else:
                 # Recursively process children for other elements (like divs)
                 for child in elem.children:
@@ -2308,7 +2419,7 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
         enumerated: bool = False,
         marker: str = "",
         extra_formatting: Optional[Formatting] = None,
-    ) -> Optional[RefItem]:
+    ) -> Optional[ListItem]:
         """Helper method to add a list item with its content.
 
         Handles both simple and complex content with inline groups.
@@ -2337,13 +2448,15 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
                 content_layer=self.content_layer,
                 prov=item_prov,
             )
-            self.parents[self.level + 1] = list_item
+            self._set_parent(self.level + 1, list_item)
             self.level += 1
 
             with self._use_inline_group(min_parts, doc):
+                text_parent = self.parents[self.level]
+                text_layer = self.content_layer
                 compacted_parts = self._compact_adjacent_single_char_parts(min_parts)
                 for annotated_text, source_tag_ids in compacted_parts:
-                    text_part = re.sub(r"\s+|\n+", " ", annotated_text.text).strip()
+                    text_part = _WHITESPACE_RE.sub(" ", annotated_text.text).strip()
                     clean_text = HTMLDocumentBackend._clean_unicode(text_part)
 
                     # Apply extra formatting if provided
@@ -2362,31 +2475,31 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
 
                     if annotated_text.code:
                         doc.add_code(
-                            parent=self.parents[self.level],
+                            parent=text_parent,
                             text=clean_text,
-                            content_layer=self.content_layer,
+                            content_layer=text_layer,
                             formatting=formatting,
                             hyperlink=annotated_text.hyperlink,
                             prov=prov,
                         )
                     else:
                         doc.add_text(
-                            parent=self.parents[self.level],
+                            parent=text_parent,
                             label=DocItemLabel.TEXT,
                             text=clean_text,
-                            content_layer=self.content_layer,
+                            content_layer=text_layer,
                             formatting=formatting,
                             hyperlink=annotated_text.hyperlink,
                             prov=prov,
                         )
 
-            self.parents[self.level] = None
+            self._set_parent(self.level, None)
             self.level -= 1
             return list_item
         else:
             # Simple content - single text element
             annotated_text = min_parts[0]
-            text = re.sub(r"\s+|\n+", " ", annotated_text.text).strip()
+            text = _WHITESPACE_RE.sub(" ", annotated_text.text).strip()
             clean_text = HTMLDocumentBackend._clean_unicode(text)
             prov = self._make_text_prov(
                 text=clean_text,
@@ -2438,14 +2551,14 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
             parent=self.parents[self.level],
             content_layer=self.content_layer,
         )
-        self.parents[self.level + 1] = list_group
+        self._set_parent(self.level + 1, list_group)
         self.ctx.list_ordered_flag_by_ref[list_group.self_ref] = is_ordered
         if is_ordered and start is not None:
             self.ctx.list_start_by_ref[list_group.self_ref] = start
         self.level += 1
 
-        # Track the number of list items added (not all children)
-        list_item_counter: int = 0
+        # Number of the next ordered list item marker, counting only added items
+        next_number: Optional[int] = start
 
         # Handle description lists (<dl> with <dt> and <dd>)
         if is_description:
@@ -2473,7 +2586,7 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
                         extra_formatting=bold_formatting,
                     )
                     if current_dt_item:
-                        self.parents[self.level + 1] = current_dt_item
+                        self._set_parent(self.level + 1, current_dt_item)
 
                 elif child_name == "dd":
                     has_nested_dl = child.find("dl", recursive=False) is not None
@@ -2514,7 +2627,7 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
                                 child, doc, processed_elements
                             )
 
-            self.parents[self.level + 1] = None
+            self._set_parent(self.level + 1, None)
             self.level -= 1
             return list_group.get_ref()
 
@@ -2530,27 +2643,12 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
 
             else:
                 # 1) determine the marker using the counter
-                marker: str = (
-                    f"{start + list_item_counter}."
-                    if is_ordered and start is not None
-                    else ""
-                )
+                marker: str = f"{next_number}." if next_number is not None else ""
 
                 # 2) Find inputs and checkboxes in this <li>
-                inputs_in_li = [
-                    input_tag
-                    for input_tag in li.find_all("input")
-                    if input_tag.find_parent("li") is li
-                ]
-                custom_checkboxes_in_li = [
-                    checkbox_tag
-                    for checkbox_tag in li.find_all(
-                        lambda item: (
-                            isinstance(item, Tag) and self._is_custom_checkbox_tag(item)
-                        )
-                    )
-                    if checkbox_tag.find_parent("li") is li
-                ]
+                inputs_in_li, custom_checkboxes_in_li = self._find_list_item_controls(
+                    li
+                )
 
                 # 3) Add the list item using the helper function
                 list_item = self._add_list_item_with_content(
@@ -2562,8 +2660,8 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
                 )
 
                 # Increment counter only when a list item is actually added
-                if list_item:
-                    list_item_counter += 1
+                if list_item and next_number is not None:
+                    next_number += 1
 
                 if list_item or inputs_in_li or custom_checkboxes_in_li:
                     with self._use_list_item_context(list_item):
@@ -2591,34 +2689,59 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
                             if not has_list_ancestor:
                                 self._handle_block(sublist, doc)
 
-        self.parents[self.level + 1] = None
+        self._set_parent(self.level + 1, None)
         self.level -= 1
         return list_group.get_ref()
 
     @staticmethod
     def get_html_table_row_col(tag: Tag) -> tuple[int, int]:
+        _, num_rows, num_cols = HTMLDocumentBackend._collect_table_rows(tag)
+        return num_rows, num_cols
+
+    @staticmethod
+    def _collect_table_rows(tag: Tag) -> tuple[list[_TableRow], int, int]:
+        """Collect the rows of a table in a single pass over its cells.
+
+        The <thead> and <tbody> wrappers are unwrapped. Nested tables are not
+        traversed.
+
+        Args:
+            tag: The HTML table tag.
+
+        Returns:
+            The table rows, and the number of rows and columns of the table,
+                taking into account the cell spans.
+        """
         for t in cast(list[Tag], tag.find_all(["thead", "tbody"], recursive=False)):
             t.unwrap()
-        # Find the number of rows and columns (taking into account spans)
+        rows: list[_TableRow] = []
         num_rows: int = 0
         num_cols: int = 0
-        for row in tag("tr", recursive=False):
+        get_cell_spans = HTMLDocumentBackend._get_cell_spans
+        # Name filters only match tags
+        for row in cast(list[Tag], tag("tr", recursive=False)):
+            cells: list[tuple[Tag, int, int]] = []
             col_count = 0
-            is_row_header = True
-            if not isinstance(row, Tag):
-                continue
-            for cell in row(["td", "th"], recursive=False):
-                if not isinstance(row, Tag):
-                    continue
-                cell_tag = cast(Tag, cell)
-                col_span, row_span = HTMLDocumentBackend._get_cell_spans(cell_tag)
+            col_header = True
+            row_header = True
+            for cell in cast(list[Tag], row(["td", "th"], recursive=False)):
+                col_span, row_span = get_cell_spans(cell)
+                cells.append((cell, col_span, row_span))
                 col_count += col_span
-                if cell_tag.name == "td" or row_span == 1:
-                    is_row_header = False
+                if cell.name == "td":
+                    col_header = False
+                    row_header = False
+                elif row_span == 1:
+                    row_header = False
+            rows.append(
+                _TableRow(
+                    tag=row, cells=cells, col_header=col_header, row_header=row_header
+                )
+            )
             num_cols = max(num_cols, col_count)
-            if not is_row_header:
+            if not row_header:
                 num_rows += 1
-        return num_rows, num_cols
+        return rows, num_rows, num_cols
 
     def _handle_block(self, tag: Tag, doc: DoclingDocument) -> list[RefItem]:  # noqa: C901
         added_refs = []
@@ -2631,7 +2754,7 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
                 if im_ref is not None:
                     added_refs.append(im_ref)
 
-        elif tag_name in {"h1", "h2", "h3", "h4", "h5", "h6"}:
+        elif tag_name in _HEADING_TAGS:
             heading_refs = self._handle_heading(tag, doc)
             added_refs.extend(heading_refs)
 
@@ -2647,6 +2770,8 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
             for part in annotated_texts.split_by_newline():
                 compacted_part = self._compact_adjacent_single_char_parts(part)
                 with self._use_inline_group(part, doc) as inline_ref:
+                    text_parent = self.parents[self.level]
+                    text_layer = self.content_layer
                     for annotated_text, source_tag_ids in compacted_part:
                         if seg := annotated_text.text.strip():
                             seg_clean = HTMLDocumentBackend._clean_unicode(seg)
@@ -2657,9 +2782,9 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
                                     source_tag_ids=source_tag_ids,
                                 )
                                 docling_code = doc.add_code(
-                                    parent=self.parents[self.level],
+                                    parent=text_parent,
                                     text=seg_clean,
-                                    content_layer=self.content_layer,
+                                    content_layer=text_layer,
                                     formatting=annotated_text.formatting,
                                     hyperlink=annotated_text.hyperlink,
                                     prov=prov,
@@ -2673,10 +2798,10 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
                                     source_tag_ids=source_tag_ids,
                                 )
                                 docling_text = doc.add_text(
-                                    parent=self.parents[self.level],
+                                    parent=text_parent,
                                     label=DocItemLabel.TEXT,
                                     text=seg_clean,
-                                    content_layer=self.content_layer,
+                                    content_layer=text_layer,
                                     formatting=annotated_text.formatting,
                                     hyperlink=annotated_text.hyperlink,
                                     prov=prov,
@@ -2705,7 +2830,7 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
                         added_refs.append(checkbox_ref)
 
         elif tag_name == "table":
-            num_rows, num_cols = self.get_html_table_row_col(tag)
+            rows, num_rows, num_cols = self._collect_table_rows(tag)
             data_e = TableData(num_rows=num_rows, num_cols=num_cols)
             table_prov = self._make_prov(text="", tag=tag)
             docling_table = doc.add_table(
@@ -2715,7 +2840,9 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
                 content_layer=self.content_layer,
             )
             added_refs.append(docling_table.get_ref())
-            self.parse_table_data(tag, doc, docling_table, num_rows, num_cols)
+            self.parse_table_data(
+                tag, doc, docling_table, num_rows, num_cols, rows=rows
+            )
 
         elif tag_name in {"stamp", "signature"}:
             _class_name = PictureClassificationLabel.STAMP.value
@@ -2745,6 +2872,8 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
             annotated_texts = text_list.simplify_text_elements()
             language_hint = self._code_language_hint(tag)
             with self._use_inline_group(annotated_texts, doc) as inline_ref:
+                text_parent = self.parents[self.level]
+                text_layer = self.content_layer
                 for annotated_text in annotated_texts:
                     text_clean = HTMLDocumentBackend._clean_unicode(
                         annotated_text.text.strip()
@@ -2755,12 +2884,12 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
                         source_tag_id=annotated_text.source_tag_id,
                     )
                     docling_code2 = doc.add_code(
-                        parent=self.parents[self.level],
+                        parent=text_parent,
                         text=text_clean,
                         code_language=detect_code_language(
                             text_clean, hint=language_hint
                         ),
-                        content_layer=self.content_layer,
+                        content_layer=text_layer,
                         formatting=annotated_text.formatting,
                         hyperlink=annotated_text.hyperlink,
                         prov=prov,
@@ -3002,22 +3131,21 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
 
     @staticmethod
     def _extract_text_excluding_ids(tag: Tag, excluded_ids: set[str]) -> str:
-        def _extract(node: PageElement) -> list[str]:
+        def _extract(node: PageElement, parts: list[str]) -> None:
             if isinstance(node, NavigableString):
-                return [str(node)]
-            if isinstance(node, Tag):
+                parts.append(str(node))
+            elif isinstance(node, Tag):
                 node_id = node.get("id")
                 if node_id and node_id in excluded_ids:
-                    return []
-                parts: list[str] = []
+                    return
                 for child in node:
-                    parts.extend(_extract(child))
+                    _extract(child, parts)
                 if node.name in {"p", "li"}:
                     parts.append(" ")
-                return parts
-            return []
 
-        return "".join(_extract(tag))
+        parts: list[str] = []
+        _extract(tag, parts)
+        return "".join(parts)
 
     @staticmethod
     def _extract_direct_text(tag: Tag) -> str:
@@ -3029,7 +3157,7 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
 
     @staticmethod
     def _normalize_form_text(text: str) -> tuple[str, str]:
-        raw = re.sub(r"\s+", " ", text).strip()
+        raw = _WHITESPACE_RE.sub(" ", text).strip()
         return raw, HTMLDocumentBackend._clean_unicode(raw)
 
     @staticmethod
@@ -3167,21 +3295,20 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
     def _extract_text_excluding_tag_obj_ids(
         tag: Tag, excluded_obj_ids: set[int]
     ) -> str:
-        def _extract(node: PageElement) -> list[str]:
+        def _extract(node: PageElement, parts: list[str]) -> None:
             if isinstance(node, NavigableString):
-                return [str(node)]
-            if isinstance(node, Tag):
+                parts.append(str(node))
+            elif isinstance(node, Tag):
                 if id(node) in excluded_obj_ids:
-                    return []
-                parts: list[str] = []
+                    return
                 for child in node.contents:
-                    parts.extend(_extract(child))
+                    _extract(child, parts)
                 if node.name in {"p", "li", "div", "label", "span", "td", "th"}:
                     parts.append(" ")
-                return parts
-            return []
 
-        return "".join(_extract(tag))
+        parts: list[str] = []
+        _extract(tag, parts)
+        return "".join(parts)
 
     @staticmethod
     def _has_direct_checkbox_like_child(tag: Tag) -> bool:
@@ -3210,7 +3337,7 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
 
     @staticmethod
     def _normalize_checkbox_text(text: str) -> str:
-        compact = re.sub(r"\s+", " ", text).strip()
+        compact = _WHITESPACE_RE.sub(" ", text).strip()
         if not compact:
             return ""
         if compact.lower() in _CHECKBOX_MARK_TEXTS:
@@ -3571,6 +3698,8 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
         tag_obj_id = id(tag)
         if any(tag_obj_id in obj_ids for obj_ids in self._suppressed_tag_obj_ids_stack):
             return True
+        if not self._suppressed_tag_ids_stack:
+            return False
         tag_ids = set()
         if html_id := self._get_html_id(tag):
             tag_ids.add(html_id)
@@ -3709,7 +3838,7 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
             for class_name in classes
         ):
             return False
-        if tag.name in {"h1", "h2", "h3", "h4", "h5", "h6"}:
+        if tag.name in _HEADING_TAGS:
             return False
         if self._is_checkbox_like_tag(tag):
             return True
@@ -4541,27 +4670,20 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
         trailing space, otherwise the text is concatenated without separators.
         """
 
-        def _extract_text_recursively(item: PageElement) -> list[str]:
-            """Recursively extract text from all child nodes."""
-            result: list[str] = []
-
-            if isinstance(item, NavigableString):
-                text = str(item).replace(_BR_SENTINEL, "\n")
-                result = [text]
-            elif isinstance(item, Tag):
-                tag = cast(Tag, item)
-                parts: list[str] = []
-                for child in tag:
-                    parts.extend(_extract_text_recursively(child))
-                result.append(
-                    "".join(parts) + " "
-                    if tag.name in {"p", "li", "th", "td"}
-                    else "".join(parts)
-                )
-
-            return result
-
-        parts: list[str] = _extract_text_recursively(item)
+        parts: list[str] = []
+        # Depth-first traversal with an explicit stack; a None entry marks the
+        # end of a tag whose text must be followed by a space.
+        stack: list[Optional[PageElement]] = [item]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                parts.append(" ")
+            elif isinstance(node, NavigableString):
+                parts.append(str(node).replace(_BR_SENTINEL, "\n"))
+            elif isinstance(node, Tag):
+                if node.name in _SPACED_TEXT_TAGS:
+                    stack.append(None)
+                stack.extend(reversed(node.contents))
 
         return "".join(parts)
 
@@ -4613,24 +4735,25 @@ class HTMLDocumentBackend(DeclarativeDocumentBackend):
         table cell tag.
         If the attribute does not exist or it is not numeric, it defaults to 1.
         """
-        raw_spans: tuple[str, str] = (
-            str(cell.get("colspan", "1")),
-            str(cell.get("rowspan", "1")),
+        attrs = cell.attrs
+        return (
+            HTMLDocumentBackend._parse_span(attrs.get("colspan")),
+            HTMLDocumentBackend._parse_span(attrs.get("rowspan")),
         )
 
-        def _extract_num(s: str) -> int:
-            if s and s[0].isnumeric():
-                match = re.search(r"\d+", s)
-                if match:
-                    return int(match.group())
+    @staticmethod
+    def _parse_span(value: Any) -> int:
+        """Parse a span attribute value, leniently accepting values like '2px'."""
+        if value is None:
             return 1
-
-        int_spans: tuple[int, int] = (
-            _extract_num(raw_spans[0]),
-            _extract_num(raw_spans[1]),
-        )
-
-        return int_spans
+        text = str(value)
+        if text.isdecimal():
+            return int(text)
+        if text and text[0].isnumeric():
+            match = _SPAN_NUMBER_RE.search(text)
+            if match:
+                return int(match.group())
+        return 1
 
     @staticmethod
     def _get_attr_as_string(tag: Tag, attr: str, default: str = "") -> str:
@@ -16,6 +16,7 @@ from pydantic import AnyUrl, ValidationError
 from docling.backend.html_backend import (
     _BR_SENTINEL,
     HTMLDocumentBackend,
+    _select_html_parser,
 )
 from docling.backend.utils.image_resource_loader import (
     validate_url_safety as _validate_url_safety,
@@ -310,6 +311,79 @@ def test_nested_table_in_description_list_item():
     assert len(doc.tables) == 1
 
 
+def test_nested_custom_checkbox_list_item():
+    """A nested <li> that is itself a custom checkbox is kept with its parent item,
+    while the controls inside nested items are left to those items."""
+    html = (
+        b"<html><body><h1>T</h1><ul><li>Outer<ul>"
+        b'<li class="checkbox">x</li><li>y</li>'
+        b"</ul></li></ul></body></html>"
+    )
+    in_doc = InputDocument(
+        path_or_stream=BytesIO(html),
+        format=InputFormat.HTML,
+        backend=HTMLDocumentBackend,
+        filename="test",
+    )
+    backend = HTMLDocumentBackend(in_doc=in_doc, path_or_stream=BytesIO(html))
+    doc = backend.convert()
+    assert doc.export_to_markdown() == "# T\n\n- Outer\n- [x] \n    - y"
+
+
+def test_select_html_parser(monkeypatch):
+    """lxml is used when bs4 can load its tree builder, html.parser otherwise."""
+    from bs4.builder import builder_registry
+
+    if builder_registry.lookup("lxml") is not None:
+        assert _select_html_parser() == "lxml"
+
+    # A missing or broken lxml leaves the builder unregistered
+    monkeypatch.setattr(builder_registry, "lookup", lambda *features: None)
+    assert _select_html_parser() == "html.parser"
+
+
+@pytest.mark.parametrize(
+    ("parser", "html", "expected"),
+    [
+        ("lxml", b"<ol><li>a<li>b<li>c</ol>", "1. a\n2. b\n3. c"),
+        (
+            "lxml",
+            b"<dl><dt>a<dd>b<dt>c<dd>d</dl>",
+            "- **a**\n    - b\n- **c**\n    - d",
+        ),
+        (
+            "lxml",
+            b"<table><tr><th>A<th>B<tr><td>1<td>2</table>",
+            "|   A |   B |\n|-----|-----|\n|   1 |   2 |",
+        ),
+        ("lxml", b"<p>a</b>b</i>c</p>", "abc"),
+        ("html.parser", b"<ol><li>a<li>b<li>c</ol>", "1. a b c"),
+        ("html.parser", b"<dl><dt>a<dd>b<dt>c<dd>d</dl>", "- **a b c d**"),
+        (
+            "html.parser",
+            b"<table><tr><th>A<th>B<tr><td>1<td>2</table>",
+            "| A  B  1  2   |\n|--------------|",
+        ),
+        ("html.parser", b"<p>a</b>b</i>c</p>", "a b c"),
+    ],
+)
+def test_malformed_html_per_parser(monkeypatch, parser, html, expected):
+    """Pin how each tree builder repairs unclosed and stray tags."""
+    if parser == "lxml":
+        pytest.importorskip("lxml.etree")
+    monkeypatch.setattr("docling.backend.html_backend._HTML_PARSER", parser)
+    html = b"<html><body>" + html + b"</body></html>"
+    in_doc = InputDocument(
+        path_or_stream=BytesIO(html),
+        format=InputFormat.HTML,
+        backend=HTMLDocumentBackend,
+        filename="test",
+    )
+    backend = HTMLDocumentBackend(in_doc=in_doc, path_or_stream=BytesIO(html))
+    doc = backend.convert()
+    assert doc.export_to_markdown() == expected
+
+
 def test_description_lists():
     """Test that HTML description lists (<dl>, <dt>, <dd>) are properly parsed."""
     test_set: list[tuple[bytes, str]] = []
@@ -423,6 +497,22 @@ def test_code_language_hint_prefers_prefixed_class():
     assert HTMLDocumentBackend._code_language_hint(plain.pre) is None
 
 
+@pytest.mark.parametrize(
+    "attrs,expected",
+    [
+        ("", (1, 1)),
+        ('colspan="3"', (3, 1)),
+        ('rowspan="2"', (1, 2)),
+        ('colspan="2px" rowspan="4.5"', (2, 4)),
+        ('colspan="abc" rowspan="-1"', (1, 1)),
+        ('colspan=" 2" rowspan=""', (1, 1)),
+    ],
+)
+def test_get_cell_spans(attrs, expected):
+    soup = BeautifulSoup(f"<table><tr><td {attrs}>x</td></tr></table>", "html.parser")
+    assert HTMLDocumentBackend._get_cell_spans(soup.td) == expected
+
+
 @pytest.fixture(scope="module")
 def html_paths() -> list[Path]:
     # Define the directory you want to search